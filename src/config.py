@@ -2,13 +2,10 @@
 Configuration management for Zoho Books integration.
 """
 
-import os
+from functools import lru_cache
 from typing import Optional
-from pydantic import BaseSettings, SecretStr
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class ZohoConfig(BaseSettings):
     """Zoho Books API configuration settings."""
@@ -17,25 +14,37 @@ class ZohoConfig(BaseSettings):
     client_id: SecretStr
     client_secret: SecretStr
     refresh_token: SecretStr
-    organization_id: str
+    
+    # Default organization; may instead be passed per call
+    organization_id: Optional[str] = None
     
     # API configuration
     api_base_url: str = "https://books.zoho.com/api/v3"
     auth_base_url: str = "https://accounts.zoho.com/oauth/v2"
     
+    # Persist access tokens under $XDG_CACHE_HOME/zoho between processes
+    token_cache: bool = True
+    
     # Optional proxy configuration
     http_proxy: Optional[str] = None
     https_proxy: Optional[str] = None
     
-    class Config:
-        """Pydantic configuration class."""
-        case_sensitive = False
-        env_prefix = "ZOHO_"
+    # Values are read from the environment, falling back to a .env file
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        env_prefix="ZOHO_",
+        env_file=".env",
+        extra="ignore",
+        frozen=True
+    )
 
+@lru_cache(maxsize=1)
 def get_config() -> ZohoConfig:
     """
     Get the Zoho Books configuration.
     
+    The result is cached; call `get_config.cache_clear()` to reload it.
+    
     Returns:
         ZohoConfig: Configuration object with all necessary settings.
     
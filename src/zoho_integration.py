@@ -2,15 +2,78 @@
 Main module for Zoho Books integration with Deluge platform.
 """
 
+import asyncio
+import hashlib
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import os
+import random
+import tempfile
+import time
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any
+import httpx
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
 from loguru import logger
 
 from .config import get_config, ZohoConfig
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Refresh the access token this many seconds before it actually expires, plus
+# up to TOKEN_REFRESH_JITTER more so concurrent clients don't refresh in lockstep
+TOKEN_REFRESH_MARGIN = 60
+TOKEN_REFRESH_JITTER = 15
+
+# Most API requests the async client keeps in flight at once. HTTP/2 streams
+# share a connection, so the connection limit alone doesn't bound this.
+ASYNC_MAX_CONCURRENCY = 8
+
+def _token_cache_path(refresh_token: str) -> Path:
+    """Get the on-disk access token cache file for a refresh token."""
+    key = hashlib.sha256(refresh_token.encode()).hexdigest()
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+    return cache_home / "zoho" / f"{key}.json"
+
+@lru_cache(maxsize=None)
+def configure_logging(path: str = "zoho_integration.log", level: str = "INFO") -> int:
+    """
+    Add a rotating file sink for the integration's logs.
+    
+    Logging is opt-in: the library never adds sinks on its own. Repeated
+    calls with the same arguments reuse the existing sink.
+    
+    Args:
+        path: Log file path
+        level: Minimum level to write
+        
+    Returns:
+        The loguru sink id
+    """
+    return logger.add(
+        path,
+        rotation="10 MB",
+        retention="1 month",
+        level=level
+    )
+
+class Endpoint(str, Enum):
+    """Zoho Books API endpoints."""
+    INVOICES = "invoices"
+    CONTACTS = "contacts"
+
 class ZohoAuthError(Exception):
     """Exception raised for authentication-related errors."""
     pass
@@ -19,6 +82,25 @@ class ZohoAPIError(Exception):
     """Exception raised for Zoho API-related errors."""
     pass
 
+class TokenState:
+    """
+    OAuth access token and the deadline after which it must be refreshed.
+    
+    Kept as a small slotted object so the per-request validity check is a
+    single method call rather than a chain of property lookups.
+    """
+    
+    __slots__ = ("token", "deadline")
+    
+    def __init__(self, token: Optional[str] = None, deadline: float = 0.0):
+        self.token = token
+        # time.monotonic() deadline, with the refresh margin already applied
+        self.deadline = deadline
+    
+    def valid(self) -> bool:
+        """Check that a token is held and is not about to expire."""
+        return self.token is not None and time.monotonic() < self.deadline
+
 class ZohoBooks:
     """
     Zoho Books API integration class.
@@ -27,19 +109,64 @@ class ZohoBooks:
     authentication and data retrieval.
     """
     
-    def __init__(self):
-        """Initialize the ZohoBooks integration with configuration."""
+    def __init__(self, organization_id: Optional[str] = None):
+        """
+        Initialize the ZohoBooks integration with configuration.
+        
+        Args:
+            organization_id: Optional default organization, overriding the
+                configured one
+        """
         self.config: ZohoConfig = get_config()
-        self._access_token: Optional[str] = None
-        self._token_expires_at: Optional[datetime] = None
-        
-        # Configure logging
-        logger.add(
-            "zoho_integration.log",
-            rotation="10 MB",
-            retention="1 month",
-            level="INFO"
+        self.organization_id: Optional[str] = (
+            organization_id or self.config.organization_id
+        )
+        self._auth = TokenState()
+        
+        # Static request pieces, built once rather than on every call.
+        # Note that _refresh_params holds the OAuth credentials in plaintext.
+        self._auth_headers: Dict[str, str] = {}
+        self._refresh_params: Dict[str, str] = {
+            "refresh_token": self.config.refresh_token.get_secret_value(),
+            "client_id": self.config.client_id.get_secret_value(),
+            "client_secret": self.config.client_secret.get_secret_value(),
+            "grant_type": "refresh_token"
+        }
+        self._api_base = self.config.api_base_url.rstrip("/") + "/"
+        self._url_cache: Dict[str, str] = {
+            endpoint: self._api_base + endpoint for endpoint in Endpoint
+        }
+        
+        # Reuse an access token persisted by an earlier process, if any
+        self._token_cache: Optional[Path] = None
+        if self.config.token_cache:
+            self._token_cache = _token_cache_path(
+                self._refresh_params["refresh_token"]
+            )
+            self._load_cached_token()
+        
+        # Persistent session so HTTPS keep-alive reuses pooled connections;
+        # transient failures on idempotent requests are retried by urllib3,
+        # and by _asend with the same policy on the async path
+        self._retry = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True
+        )
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=self._retry)
         )
+        self._session.headers["Content-Type"] = "application/json"
+        
+        # Async client is created lazily, inside a running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._limiter: Optional[asyncio.Semaphore] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
     
     @property
     def access_token(self) -> str:
@@ -52,16 +179,9 @@ class ZohoBooks:
         Raises:
             ZohoAuthError: If unable to obtain a valid access token.
         """
-        if not self._access_token or self._token_expired:
+        if not self._auth.valid():
             self._refresh_access_token()
-        return self._access_token
-    
-    @property
-    def _token_expired(self) -> bool:
-        """Check if the current access token has expired."""
-        if not self._token_expires_at:
-            return True
-        return datetime.now() >= self._token_expires_at
+        return self._auth.token
     
     def _refresh_access_token(self) -> None:
         """
@@ -71,34 +191,216 @@ class ZohoBooks:
             ZohoAuthError: If token refresh fails.
         """
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.config.auth_base_url}/token",
-                params={
-                    "refresh_token": self.config.refresh_token.get_secret_value(),
-                    "client_id": self.config.client_id.get_secret_value(),
-                    "client_secret": self.config.client_secret.get_secret_value(),
-                    "grant_type": "refresh_token"
-                }
+                params=self._refresh_params
             )
             
             response.raise_for_status()
-            data = response.json()
+            self._store_token(response.json())
             
-            self._access_token = data["access_token"]
-            self._token_expires_at = datetime.now() + timedelta(
-                seconds=data.get("expires_in", 3600)
+        except Exception as e:
+            logger.error(f"Failed to refresh access token: {str(e)}")
+            raise ZohoAuthError("Failed to refresh access token") from e
+    
+    async def _arefresh_access_token(self) -> None:
+        """
+        Refresh the access token using the refresh token, asynchronously.
+        
+        Raises:
+            ZohoAuthError: If token refresh fails.
+        """
+        try:
+            response = await self._get_async_client().post(
+                f"{self.config.auth_base_url}/token",
+                params=self._refresh_params
             )
             
-            logger.info("Successfully refreshed access token")
+            response.raise_for_status()
+            self._store_token(response.json())
             
         except Exception as e:
             logger.error(f"Failed to refresh access token: {str(e)}")
             raise ZohoAuthError("Failed to refresh access token") from e
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
+    async def _aensure_token(self, rejected: Optional[str] = None) -> None:
+        """
+        Refresh the access token unless another task already has.
+        
+        Concurrent requests share one refresh: whoever takes the lock first
+        refreshes, and the rest reuse the token it obtained.
+        
+        Args:
+            rejected: Token the server just rejected, if any. Without one,
+                the token is refreshed only if it is no longer valid.
+        
+        Raises:
+            ZohoAuthError: If token refresh fails.
+        """
+        self._get_async_client()
+        async with self._refresh_lock:
+            if rejected is None:
+                if self._auth.valid():
+                    return
+            elif self._auth.token != rejected:
+                return
+            await self._arefresh_access_token()
+    
+    def _store_token(self, data: Dict) -> None:
+        """Store the access token and expiry from a token response."""
+        self._auth.token = data["access_token"]
+        self._auth_headers = {"Authorization": f"Bearer {self._auth.token}"}
+        self._auth.deadline = (
+            time.monotonic()
+            + data.get("expires_in", 3600)
+            - TOKEN_REFRESH_MARGIN
+            - random.uniform(0, TOKEN_REFRESH_JITTER)
+        )
+        
+        logger.info("Successfully refreshed access token")
+        self._save_cached_token()
+    
+    def _load_cached_token(self) -> None:
+        """Load a still-valid access token from the on-disk cache."""
+        try:
+            cached = json.loads(self._token_cache.read_text())
+            token = cached["token"]
+            # Stored as wall-clock time, since monotonic time doesn't
+            # survive a reboot
+            remaining = cached["expires_at"] - time.time()
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        
+        if remaining > 0:
+            self._auth.token = token
+            self._auth.deadline = time.monotonic() + remaining
+            self._auth_headers = {"Authorization": f"Bearer {token}"}
+            logger.info("Loaded cached access token")
+    
+    def _save_cached_token(self) -> None:
+        """Atomically persist the access token to the on-disk cache."""
+        if self._token_cache is None:
+            return
+        
+        expires_at = time.time() + (self._auth.deadline - time.monotonic())
+        try:
+            self._token_cache.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # mkstemp creates the file with mode 0600
+            fd, tmp_path = tempfile.mkstemp(dir=self._token_cache.parent)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"token": self._auth.token, "expires_at": expires_at}, f)
+                os.replace(tmp_path, self._token_cache)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to cache access token: {str(e)}")
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the async HTTP/2 client, creating it on first use.
+        
+        All API calls go to a single origin, so concurrent requests are
+        multiplexed as streams over one connection. Must be called from
+        within a running event loop; the client's connections belong to that
+        loop, so a new client is created when called from a different one.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client.is_closed
+            or self._client_loop is not loop
+        ):
+            self._client_loop = loop
+            self._limiter = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+            self._refresh_lock = asyncio.Lock()
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers={"Content-Type": "application/json"},
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=4,
+                    max_keepalive_connections=4
+                )
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened."""
+        # A client from an earlier, finished event loop can't be closed from
+        # this one; it is simply dropped
+        if (
+            self._client is not None
+            and self._client_loop is asyncio.get_running_loop()
+        ):
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+        self._limiter = None
+        self._refresh_lock = None
+    
+    async def _asend(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict],
+        body: Optional[bytes]
+    ) -> httpx.Response:
+        """
+        Send an async request, retrying transient failures.
+        
+        Follows the same policy as the sync session's urllib3 `Retry`: GET and
+        HEAD requests answered with 429 or 5xx are retried with exponential
+        backoff, waiting for `Retry-After` when the server sends one.
+        """
+        client = self._get_async_client()
+        for retries in range(self._retry.total + 1):
+            async with self._limiter:
+                response = await client.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    content=body
+                )
+            
+            retry_after = response.headers.get("Retry-After")
+            if retries == self._retry.total or not self._retry.is_retry(
+                method, response.status_code, retry_after is not None
+            ):
+                return response
+            
+            delay = 0.0 if retries == 0 else min(
+                self._retry.backoff_max,
+                self._retry.backoff_factor * (2 ** retries)
+            )
+            if retry_after is not None:
+                try:
+                    delay = self._retry.parse_retry_after(retry_after)
+                except InvalidHeader:
+                    pass
+            
+            logger.warning(
+                f"Request returned {response.status_code}, "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    
+    def _url(self, endpoint: str) -> str:
+        """
+        Get the full URL for an endpoint.
+        
+        URLs for `Endpoint` members are joined once at init; other endpoints,
+        such as ones embedding a record ID, are joined per call so the cache
+        can't grow without bound.
+        """
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            url = self._api_base + endpoint
+        return url
+    
     def _make_request(
         self,
         method: str,
@@ -111,7 +413,7 @@ class ZohoBooks:
         
         Args:
             method: HTTP method to use
-            endpoint: API endpoint to call
+            endpoint: API endpoint to call, e.g. an `Endpoint` member
             params: Optional query parameters
             data: Optional request body
             
@@ -121,63 +423,315 @@ class ZohoBooks:
         Raises:
             ZohoAPIError: If the API request fails
         """
+        response = None
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            }
-            
-            url = f"{self.config.api_base_url}/{endpoint}"
-            
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=data
-            )
+            if not self._auth.valid():
+                self._refresh_access_token()
+            
+            body = None if data is None else _json_dumps(data)
+            for attempt in (1, 2):
+                response = self._session.request(
+                    method=method,
+                    url=self._url(endpoint),
+                    headers=self._auth_headers,
+                    params=params,
+                    data=body
+                )
+                if response.status_code != 401 or attempt == 2:
+                    break
+                response.close()
+                # Token was rejected before its expiry; refresh and retry once
+                logger.warning("Access token rejected, refreshing and retrying")
+                self._refresh_access_token()
             
             response.raise_for_status()
-            return response.json()
+            if response.status_code == 204 or not response.content:
+                return {}
+            return _json_loads(response.content)
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError covers a response body that isn't valid JSON
             logger.error(f"API request failed: {str(e)}")
             raise ZohoAPIError(f"API request failed: {str(e)}") from e
+        finally:
+            # Hand the connection back to the session pool promptly
+            if response is not None:
+                response.close()
     
-    def get_invoices(
+    async def _amake_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Make an authenticated request to the Zoho Books API, asynchronously.
+        
+        Args:
+            method: HTTP method to use
+            endpoint: API endpoint to call, e.g. an `Endpoint` member
+            params: Optional query parameters
+            data: Optional request body
+            
+        Returns:
+            Dict containing the API response
+            
+        Raises:
+            ZohoAPIError: If the API request fails
+        """
+        if not self._auth.valid():
+            await self._aensure_token()
+        
+        try:
+            body = None if data is None else _json_dumps(data)
+            for attempt in (1, 2):
+                token, headers = self._auth.token, self._auth_headers
+                response = await self._asend(
+                    method, self._url(endpoint), headers, params, body
+                )
+                if response.status_code != 401 or attempt == 2:
+                    break
+                # Token was rejected before its expiry; refresh and retry once
+                logger.warning("Access token rejected, refreshing and retrying")
+                await self._aensure_token(rejected=token)
+            
+            response.raise_for_status()
+            if response.status_code == 204 or not response.content:
+                return {}
+            return _json_loads(response.content)
+            
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError covers a response body that isn't valid JSON
+            logger.error(f"API request failed: {str(e)}")
+            raise ZohoAPIError(f"API request failed: {str(e)}") from e
+    
+    def _invoice_params(
+        self,
+        from_date: Optional[str],
+        to_date: Optional[str],
+        status: Optional[str],
+        organization_id: Optional[str]
+    ) -> Dict[str, str]:
+        """
+        Build the query parameters for an invoice listing.
+        
+        Raises:
+            ValueError: If no organization is given or configured.
+        """
+        organization_id = organization_id or self.organization_id
+        if not organization_id:
+            raise ValueError(
+                "An organization_id is required when ZOHO_ORGANIZATION_ID "
+                "is not set."
+            )
+        
+        params = {
+            key: value
+            for key, value in (
+                ("organization_id", organization_id),
+                ("date_start", from_date),
+                ("date_end", to_date),
+                ("status", status)
+            )
+            if value
+        }
+        
+        logger.opt(lazy=True).info(
+            "Retrieving invoices with params: {}", lambda: params
+        )
+        return params
+    
+    async def _aget_page(self, page: int, params: Dict) -> Dict:
+        """Fetch a single page of invoices."""
+        return await self._amake_request(
+            method="GET",
+            endpoint=Endpoint.INVOICES,
+            params={**params, "page": page}
+        )
+    
+    async def aget_invoices(
         self,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        organization_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Retrieve invoices from Zoho Books.
+        Retrieve all pages of invoices from Zoho Books concurrently.
+        
+        The first page is fetched to learn the page count; the remaining
+        pages are then requested in parallel.
         
         Args:
             from_date: Optional start date (YYYY-MM-DD)
             to_date: Optional end date (YYYY-MM-DD)
             status: Optional invoice status filter
+            organization_id: Optional organization, defaulting to the
+                configured one
             
         Returns:
             List of invoice dictionaries
         """
-        params = {
-            "organization_id": self.config.organization_id,
-        }
+        params = self._invoice_params(
+            from_date, to_date, status, organization_id
+        )
+        
+        response = await self._aget_page(1, params)
+        invoices = list(response.get("invoices", []))
+        page_context = response.get("page_context", {})
+        
+        total_pages = page_context.get("total_pages")
+        if total_pages:
+            tasks = [
+                asyncio.ensure_future(self._aget_page(page, params))
+                for page in range(2, total_pages + 1)
+            ]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # gather doesn't cancel the other pages when one fails
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            for result in results:
+                invoices.extend(result.get("invoices", []))
+        else:
+            # Page count unknown; walk the remaining pages in order
+            page = 1
+            while page_context.get("has_more_page"):
+                page += 1
+                response = await self._aget_page(page, params)
+                invoices.extend(response.get("invoices", []))
+                page_context = response.get("page_context", {})
+        
+        return invoices
+    
+    async def get_invoices_multi(
+        self,
+        organization_ids: List[str],
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve invoices for several organizations concurrently.
         
-        if from_date:
-            params["date_start"] = from_date
-        if to_date:
-            params["date_end"] = to_date
-        if status:
-            params["status"] = status
+        The access token authorizes the user rather than an organization, so
+        a single token and HTTP client are shared across all of them.
+        
+        Args:
+            organization_ids: Organizations to retrieve invoices for
+            from_date: Optional start date (YYYY-MM-DD)
+            to_date: Optional end date (YYYY-MM-DD)
+            status: Optional invoice status filter
             
-        logger.info(f"Retrieving invoices with params: {params}")
+        Returns:
+            Dict mapping each organization ID to its list of invoices
+        """
+        # Refresh up front so the fan-out doesn't refresh once per organization
+        if not self._auth.valid():
+            await self._aensure_token()
         
-        response = self._make_request(
-            method="GET",
-            endpoint="invoices",
-            params=params
+        results = await asyncio.gather(*[
+            self.aget_invoices(from_date, to_date, status, organization_id)
+            for organization_id in organization_ids
+        ])
+        return dict(zip(organization_ids, results))
+    
+    def iter_invoices(
+        self,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        status: Optional[str] = None,
+        organization_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream invoices from Zoho Books, one page at a time.
+        
+        Each page is requested only once the previous one has been consumed,
+        so at most one page of invoices is held in memory.
+        
+        Args:
+            from_date: Optional start date (YYYY-MM-DD)
+            to_date: Optional end date (YYYY-MM-DD)
+            status: Optional invoice status filter
+            organization_id: Optional organization, defaulting to the
+                configured one
+            
+        Yields:
+            Invoice dictionaries
+        """
+        params = self._invoice_params(
+            from_date, to_date, status, organization_id
         )
         
-        return response.get("invoices", []) 
\ No newline at end of file
+        page = 1
+        while True:
+            response = self._make_request(
+                method="GET",
+                endpoint=Endpoint.INVOICES,
+                params={**params, "page": page}
+            )
+            yield from response.get("invoices", [])
+            
+            page_context = response.get("page_context", {})
+            total_pages = page_context.get("total_pages")
+            if total_pages:
+                has_more = page < total_pages
+            else:
+                has_more = page_context.get("has_more_page", False)
+            if not has_more:
+                break
+            page += 1
+    
+    def get_invoices(
+        self,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        status: Optional[str] = None,
+        organization_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve invoices from Zoho Books.
+        
+        Args:
+            from_date: Optional start date (YYYY-MM-DD)
+            to_date: Optional end date (YYYY-MM-DD)
+            status: Optional invoice status filter
+            organization_id: Optional organization, defaulting to the
+                configured one
+            
+        Returns:
+            List of invoice dictionaries
+        """
+        return list(
+            self.iter_invoices(from_date, to_date, status, organization_id)
+        )
+
+@lru_cache(maxsize=None)
+def _get_client(organization_id: Optional[str]) -> ZohoBooks:
+    """Create the cached client for an already-resolved organization."""
+    return ZohoBooks(organization_id)
+
+def get_client(organization_id: Optional[str] = None) -> ZohoBooks:
+    """
+    Get a shared ZohoBooks client.
+    
+    Clients are cached per organization so all call sites in a process share
+    one HTTP session and access token; omitting the organization is the same
+    as passing the configured one. Call `clear_clients()` to drop the cached
+    clients, e.g. in test teardown.
+    
+    Args:
+        organization_id: Optional default organization for the client
+        
+    Returns:
+        ZohoBooks: The cached client for that organization
+    """
+    return _get_client(organization_id or get_config().organization_id)
+
+def clear_clients() -> None:
+    """Drop all clients cached by `get_client`."""
+    _get_client.cache_clear()
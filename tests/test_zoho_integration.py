@@ -2,11 +2,29 @@
 Unit tests for Zoho Books integration.
 """
 
+import asyncio
+import httpx
 import pytest
-from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
-from src.zoho_integration import ZohoBooks, ZohoAuthError, ZohoAPIError
-from src.config import ZohoConfig
+import requests
+import respx
+import responses
+import time
+from responses import matchers
+from unittest.mock import patch
+from src.zoho_integration import (
+    ASYNC_MAX_CONCURRENCY, Endpoint, ZohoBooks, ZohoAuthError, ZohoAPIError,
+    clear_clients, configure_logging, get_client
+)
+from src.config import ZohoConfig, get_config
+
+TOKEN_URL = "https://accounts.zoho.com/oauth/v2/token"
+API_URL = "https://books.zoho.com/api/v3"
+
+@pytest.fixture(autouse=True)
+def token_cache_dir(tmp_path, monkeypatch):
+    """Fixture keeping the on-disk token cache out of the real home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path / "zoho"
 
 @pytest.fixture
 def mock_config():
@@ -18,73 +36,485 @@ def mock_config():
         organization_id="test_org_id"
     )
 
+@pytest.fixture
+def zoho_env(monkeypatch):
+    """Fixture providing ZOHO_* environment variables and a fresh config cache."""
+    monkeypatch.setenv("ZOHO_CLIENT_ID", "env_client_id")
+    monkeypatch.setenv("ZOHO_CLIENT_SECRET", "env_client_secret")
+    monkeypatch.setenv("ZOHO_REFRESH_TOKEN", "env_refresh_token")
+    monkeypatch.setenv("ZOHO_ORGANIZATION_ID", "env_org_id")
+    get_config.cache_clear()
+    yield
+    get_config.cache_clear()
+
 @pytest.fixture
 def zoho_books(mock_config):
     """Fixture providing a ZohoBooks instance with mocked config."""
     with patch('src.zoho_integration.get_config', return_value=mock_config):
         return ZohoBooks()
 
-def test_token_expired_when_no_expiry_set(zoho_books):
-    """Test that token is considered expired when no expiry is set."""
-    assert zoho_books._token_expired is True
+def test_get_config_is_cached(zoho_env):
+    """Test that repeated config lookups return the same object."""
+    config = get_config()
+    assert config.organization_id == "env_org_id"
+    assert get_config() is config
+
+@patch('src.zoho_integration.logger')
+def test_configure_logging_adds_sink_once(mock_logger):
+    """Test that repeated logging setup registers a single sink."""
+    configure_logging.cache_clear()
+    try:
+        configure_logging("test.log")
+        configure_logging("test.log")
+        assert mock_logger.add.call_count == 1
+    finally:
+        configure_logging.cache_clear()
+
+def test_token_expired_when_no_token_set(zoho_books):
+    """Test that token is considered expired when none has been fetched."""
+    assert zoho_books._auth.valid() is False
 
 def test_token_expired_when_past_expiry(zoho_books):
     """Test that token is considered expired when past expiry time."""
-    zoho_books._token_expires_at = datetime.now() - timedelta(minutes=5)
-    assert zoho_books._token_expired is True
+    zoho_books._auth.token = "test_token"
+    zoho_books._auth.deadline = time.monotonic() - 300
+    assert zoho_books._auth.valid() is False
 
 def test_token_not_expired_when_valid(zoho_books):
     """Test that token is not considered expired when within expiry time."""
-    zoho_books._token_expires_at = datetime.now() + timedelta(minutes=5)
-    assert zoho_books._token_expired is False
+    zoho_books._auth.token = "test_token"
+    zoho_books._auth.deadline = time.monotonic() + 300
+    assert zoho_books._auth.valid() is True
+
+def test_token_expired_within_refresh_margin(zoho_books):
+    """Test that token is refreshed early when close to expiry."""
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 30})
+    assert zoho_books._auth.valid() is False
 
-@patch('requests.post')
-def test_refresh_access_token_success(mock_post, zoho_books):
+@responses.activate
+def test_refresh_access_token_success(zoho_books):
     """Test successful access token refresh."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
-        "access_token": "new_token",
-        "expires_in": 3600
-    }
-    mock_post.return_value = mock_response
+    responses.add(
+        responses.POST,
+        TOKEN_URL,
+        json={"access_token": "new_token", "expires_in": 3600},
+        status=200
+    )
     
     zoho_books._refresh_access_token()
     
-    assert zoho_books._access_token == "new_token"
-    assert zoho_books._token_expires_at is not None
+    assert zoho_books._auth.token == "new_token"
+    assert responses.calls[0].request.params == {
+        "refresh_token": "test_refresh_token",
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "grant_type": "refresh_token"
+    }
+    assert zoho_books._auth.valid() is True
+
+def test_token_cache_reused_by_new_instance(zoho_books, mock_config, token_cache_dir):
+    """Test that a token stored by one instance is loaded by the next."""
+    zoho_books._store_token({"access_token": "cached_token", "expires_in": 3600})
+    
+    cache_files = list(token_cache_dir.iterdir())
+    assert len(cache_files) == 1
+    assert cache_files[0].stat().st_mode & 0o777 == 0o600
+    
+    with patch('src.zoho_integration.get_config', return_value=mock_config):
+        other = ZohoBooks()
+    
+    assert other._auth.valid() is True
+    assert other._auth_headers == {"Authorization": "Bearer cached_token"}
+
+def test_token_cache_ignores_expired_token(zoho_books, mock_config):
+    """Test that an expired cached token is not loaded."""
+    zoho_books._store_token({"access_token": "cached_token", "expires_in": 30})
+    
+    with patch('src.zoho_integration.get_config', return_value=mock_config):
+        other = ZohoBooks()
+    
+    assert other._auth.valid() is False
+
+def test_token_cache_disabled(mock_config, token_cache_dir):
+    """Test that nothing is written when the token cache is disabled."""
+    config = mock_config.model_copy(update={"token_cache": False})
+    with patch('src.zoho_integration.get_config', return_value=config):
+        zoho_books = ZohoBooks()
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    assert not token_cache_dir.exists()
 
-@patch('requests.post')
-def test_refresh_access_token_failure(mock_post, zoho_books):
+@responses.activate
+def test_refresh_access_token_failure(zoho_books):
     """Test access token refresh failure."""
-    mock_post.side_effect = Exception("API Error")
+    responses.add(responses.POST, TOKEN_URL, json={"error": "invalid_code"}, status=400)
     
     with pytest.raises(ZohoAuthError):
         zoho_books._refresh_access_token()
 
-@patch('requests.request')
-def test_make_request_success(mock_request, zoho_books):
+@responses.activate
+def test_make_request_success(zoho_books):
     """Test successful API request."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"data": "test"}
-    mock_request.return_value = mock_response
+    responses.add(
+        responses.GET,
+        f"{API_URL}/test_endpoint",
+        json={"data": "test"},
+        match=[matchers.header_matcher({"Authorization": "Bearer test_token"})]
+    )
     
-    zoho_books._access_token = "test_token"
-    zoho_books._token_expires_at = datetime.now() + timedelta(hours=1)
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
     
     result = zoho_books._make_request("GET", "test_endpoint")
     assert result == {"data": "test"}
 
-@patch('requests.request')
-def test_make_request_failure(mock_request, zoho_books):
+@responses.activate
+def test_make_request_with_endpoint_enum(zoho_books):
+    """Test that only Endpoint URLs are cached, whether passed as enum or string."""
+    responses.add(responses.GET, f"{API_URL}/contacts", json={"contacts": []})
+    responses.add(responses.GET, f"{API_URL}/contacts/42", json={"contact": {}})
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    zoho_books._make_request("GET", Endpoint.CONTACTS)
+    zoho_books._make_request("GET", "contacts")
+    zoho_books._make_request("GET", "contacts/42")
+    
+    assert [call.request.url for call in responses.calls] == [
+        f"{API_URL}/contacts",
+        f"{API_URL}/contacts",
+        f"{API_URL}/contacts/42"
+    ]
+    assert len(zoho_books._url_cache) == len(Endpoint)
+
+@responses.activate
+def test_make_request_serializes_body(zoho_books):
+    """Test that the request body is sent as pre-serialized JSON."""
+    responses.add(
+        responses.POST,
+        f"{API_URL}/invoices",
+        json={"code": 0},
+        match=[
+            matchers.json_params_matcher({"customer_id": "1"}),
+            matchers.header_matcher({"Content-Type": "application/json"})
+        ]
+    )
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    result = zoho_books._make_request("POST", "invoices", data={"customer_id": "1"})
+    assert result == {"code": 0}
+    assert isinstance(responses.calls[0].request.body, bytes)
+
+@responses.activate
+def test_make_request_empty_response(zoho_books):
+    """Test that an empty response body is returned as an empty dict."""
+    responses.add(responses.DELETE, f"{API_URL}/test_endpoint", status=204)
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    result = zoho_books._make_request("DELETE", "test_endpoint")
+    assert result == {}
+
+@responses.activate
+def test_make_request_failure(zoho_books):
     """Test API request failure."""
-    mock_request.side_effect = Exception("API Error")
+    responses.add(
+        responses.GET,
+        f"{API_URL}/test_endpoint",
+        body=requests.exceptions.ConnectionError("API Error")
+    )
     
-    zoho_books._access_token = "test_token"
-    zoho_books._token_expires_at = datetime.now() + timedelta(hours=1)
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
     
     with pytest.raises(ZohoAPIError):
         zoho_books._make_request("GET", "test_endpoint")
 
+@responses.activate
+def test_make_request_invalid_json(zoho_books):
+    """Test that a non-JSON response body is reported as an API error."""
+    responses.add(
+        responses.GET,
+        f"{API_URL}/test_endpoint",
+        body="<html>Down for maintenance</html>",
+        content_type="text/html"
+    )
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    with pytest.raises(ZohoAPIError):
+        zoho_books._make_request("GET", "test_endpoint")
+
+@responses.activate
+def test_make_request_retries_server_errors(zoho_books):
+    """Test that transient server errors are retried by the session adapter."""
+    zoho_books._session.get_adapter(API_URL).max_retries.backoff_factor = 0
+    responses.add(responses.GET, f"{API_URL}/test_endpoint", status=503)
+    responses.add(responses.GET, f"{API_URL}/test_endpoint", json={"data": "test"})
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    result = zoho_books._make_request("GET", "test_endpoint")
+    
+    assert result == {"data": "test"}
+    assert len(responses.calls) == 2
+
+@responses.activate
+def test_make_request_does_not_retry_post(zoho_books):
+    """Test that non-idempotent requests are not retried."""
+    responses.add(responses.POST, f"{API_URL}/invoices", status=503)
+    
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    with pytest.raises(ZohoAPIError):
+        zoho_books._make_request("POST", "invoices", data={})
+    assert len(responses.calls) == 1
+
+@responses.activate
+def test_make_request_refreshes_token_on_401(zoho_books):
+    """Test that a rejected token is refreshed and the request retried once."""
+    responses.add(
+        responses.GET,
+        f"{API_URL}/test_endpoint",
+        status=401,
+        match=[matchers.header_matcher({"Authorization": "Bearer stale_token"})]
+    )
+    responses.add(
+        responses.GET,
+        f"{API_URL}/test_endpoint",
+        json={"data": "test"},
+        match=[matchers.header_matcher({"Authorization": "Bearer new_token"})]
+    )
+    token = responses.add(
+        responses.POST,
+        TOKEN_URL,
+        json={"access_token": "new_token", "expires_in": 3600}
+    )
+    
+    zoho_books._store_token({"access_token": "stale_token", "expires_in": 3600})
+    
+    result = zoho_books._make_request("GET", "test_endpoint")
+    
+    assert result == {"data": "test"}
+    assert token.call_count == 1
+
+@respx.mock
+def test_amake_request_success(zoho_books):
+    """Test successful async API request, refreshing the token first."""
+    token = respx.post(TOKEN_URL).respond(
+        json={"access_token": "new_token", "expires_in": 3600}
+    )
+    api = respx.get(f"{API_URL}/test_endpoint").respond(json={"data": "test"})
+    
+    async def run():
+        try:
+            return await zoho_books._amake_request("GET", "test_endpoint")
+        finally:
+            await zoho_books.aclose()
+    
+    assert asyncio.run(run()) == {"data": "test"}
+    assert token.call_count == 1
+    assert api.calls.last.request.headers["Authorization"] == "Bearer new_token"
+
+@respx.mock
+def test_amake_request_refreshes_token_on_401(zoho_books):
+    """Test that a rejected token is refreshed and the async request retried."""
+    token = respx.post(TOKEN_URL).respond(
+        json={"access_token": "new_token", "expires_in": 3600}
+    )
+    respx.get(f"{API_URL}/test_endpoint").mock(side_effect=[
+        httpx.Response(401),
+        httpx.Response(200, json={"data": "test"})
+    ])
+    zoho_books._store_token({"access_token": "stale_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books._amake_request("GET", "test_endpoint")
+        finally:
+            await zoho_books.aclose()
+    
+    assert asyncio.run(run()) == {"data": "test"}
+    assert token.call_count == 1
+
+@respx.mock
+def test_aget_invoices_across_event_loops(zoho_books):
+    """Test that one instance can be used from successive event loops."""
+    respx.post(TOKEN_URL).respond(
+        json={"access_token": "new_token", "expires_in": 3600}
+    )
+    respx.get(f"{API_URL}/invoices").respond(json={"invoices": [{"id": "1"}]})
+    
+    clients = []
+    
+    async def run():
+        invoices = await zoho_books.aget_invoices()
+        clients.append(zoho_books._client)
+        return invoices
+    
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+    
+    assert first == second == [{"id": "1"}]
+    # Connections are bound to their loop, so each loop gets its own client
+    assert clients[0] is not clients[1]
+
+@respx.mock
+def test_amake_request_retries_rate_limit(zoho_books):
+    """Test that a 429 is retried after the server's Retry-After delay."""
+    api = respx.get(f"{API_URL}/test_endpoint").mock(side_effect=[
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"data": "test"})
+    ])
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books._amake_request("GET", "test_endpoint")
+        finally:
+            await zoho_books.aclose()
+    
+    assert asyncio.run(run()) == {"data": "test"}
+    assert api.call_count == 2
+
+@respx.mock
+def test_amake_request_does_not_retry_post(zoho_books):
+    """Test that non-idempotent async requests are not retried."""
+    api = respx.post(f"{API_URL}/invoices").respond(status_code=503)
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books._amake_request("POST", "invoices", data={})
+        finally:
+            await zoho_books.aclose()
+    
+    with pytest.raises(ZohoAPIError):
+        asyncio.run(run())
+    assert api.call_count == 1
+
+@respx.mock
+def test_aget_invoices_limits_concurrency(zoho_books):
+    """Test that the page fan-out keeps a bounded number of requests in flight."""
+    in_flight = 0
+    peak = 0
+    
+    async def page_response(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={
+            "invoices": [{"id": request.url.params["page"]}],
+            "page_context": {"total_pages": 20}
+        })
+    
+    respx.get(f"{API_URL}/invoices").mock(side_effect=page_response)
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books.aget_invoices()
+        finally:
+            await zoho_books.aclose()
+    
+    assert len(asyncio.run(run())) == 20
+    assert peak == ASYNC_MAX_CONCURRENCY
+
+@respx.mock
+def test_aget_invoices_refreshes_rejected_token_once(zoho_books):
+    """Test that concurrent 401s share a single token refresh."""
+    token = respx.post(TOKEN_URL).respond(
+        json={"access_token": "new_token", "expires_in": 3600}
+    )
+    
+    async def page_response(request):
+        await asyncio.sleep(0.01)
+        page = request.url.params["page"]
+        # The token is revoked after the first page is served
+        if page != "1" and request.headers["Authorization"] == "Bearer stale_token":
+            return httpx.Response(401)
+        return httpx.Response(200, json={
+            "invoices": [{"id": page}],
+            "page_context": {"total_pages": 10}
+        })
+    
+    respx.get(f"{API_URL}/invoices").mock(side_effect=page_response)
+    zoho_books._store_token({"access_token": "stale_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books.aget_invoices()
+        finally:
+            await zoho_books.aclose()
+    
+    assert len(asyncio.run(run())) == 10
+    assert token.call_count == 1
+
+@respx.mock
+def test_aget_invoices_cancels_pages_on_failure(zoho_books):
+    """Test that outstanding pages are cancelled when one page fails."""
+    async def page_response(request):
+        page = int(request.url.params["page"])
+        if page == 2:
+            return httpx.Response(400)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={
+            "invoices": [{"id": page}],
+            "page_context": {"total_pages": 20}
+        })
+    
+    api = respx.get(f"{API_URL}/invoices").mock(side_effect=page_response)
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            with pytest.raises(ZohoAPIError):
+                await zoho_books.aget_invoices()
+            # Nothing should still be running once the error is raised
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+            await asyncio.sleep(0.2)
+        finally:
+            await zoho_books.aclose()
+    
+    asyncio.run(run())
+    assert api.call_count < 20
+
+@respx.mock
+def test_amake_request_invalid_json(zoho_books):
+    """Test that a non-JSON async response body is reported as an API error."""
+    respx.get(f"{API_URL}/test_endpoint").respond(
+        200, html="<html>Down for maintenance</html>"
+    )
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books._amake_request("GET", "test_endpoint")
+        finally:
+            await zoho_books.aclose()
+    
+    with pytest.raises(ZohoAPIError):
+        asyncio.run(run())
+
+@respx.mock
+def test_amake_request_failure(zoho_books):
+    """Test async API request failure once retries are exhausted."""
+    zoho_books._retry.backoff_factor = 0
+    api = respx.get(f"{API_URL}/test_endpoint").respond(status_code=500)
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    async def run():
+        try:
+            return await zoho_books._amake_request("GET", "test_endpoint")
+        finally:
+            await zoho_books.aclose()
+    
+    with pytest.raises(ZohoAPIError):
+        asyncio.run(run())
+    assert api.call_count == 4
+
 @patch.object(ZohoBooks, '_make_request')
 def test_get_invoices_success(mock_make_request, zoho_books):
     """Test successful invoice retrieval."""
@@ -104,6 +534,13 @@ def test_get_invoices_success(mock_make_request, zoho_books):
     assert len(result) == 2
     assert result[0]["id"] == "1"
     assert result[1]["amount"] == 200
+    assert mock_make_request.call_args.kwargs["params"] == {
+        "organization_id": "test_org_id",
+        "date_start": "2024-01-01",
+        "date_end": "2024-01-31",
+        "status": "sent",
+        "page": 1
+    }
 
 @patch.object(ZohoBooks, '_make_request')
 def test_get_invoices_empty_response(mock_make_request, zoho_books):
@@ -111,4 +548,120 @@ def test_get_invoices_empty_response(mock_make_request, zoho_books):
     mock_make_request.return_value = {}
     
     result = zoho_books.get_invoices()
-    assert result == [] 
\ No newline at end of file
+    assert result == []
+
+@patch.object(ZohoBooks, '_make_request')
+def test_get_invoices_follows_has_more_page(mock_make_request, zoho_books):
+    """Test that get_invoices walks every page."""
+    mock_make_request.side_effect = [
+        {"invoices": [{"id": "1"}], "page_context": {"has_more_page": True}},
+        {"invoices": [{"id": "2"}], "page_context": {"has_more_page": False}},
+    ]
+    
+    result = zoho_books.get_invoices()
+    
+    assert [invoice["id"] for invoice in result] == ["1", "2"]
+    assert mock_make_request.call_args.kwargs["params"]["page"] == 2
+
+@patch.object(ZohoBooks, '_make_request')
+def test_iter_invoices_fetches_pages_lazily(mock_make_request, zoho_books):
+    """Test that the next page is only requested once the current is consumed."""
+    mock_make_request.side_effect = [
+        {"invoices": [{"id": "1"}], "page_context": {"has_more_page": True}},
+        {"invoices": [{"id": "2"}], "page_context": {"has_more_page": False}},
+    ]
+    
+    invoices = zoho_books.iter_invoices()
+    
+    assert next(invoices)["id"] == "1"
+    assert mock_make_request.call_count == 1
+    assert next(invoices)["id"] == "2"
+    assert mock_make_request.call_count == 2
+
+@patch.object(ZohoBooks, '_amake_request')
+def test_aget_invoices_fetches_all_pages(mock_make_request, zoho_books):
+    """Test that remaining pages are fetched after the first."""
+    def page_response(method, endpoint, params=None, data=None):
+        page = params["page"]
+        return {
+            "invoices": [{"id": str(page)}],
+            "page_context": {"page": page, "total_pages": 3}
+        }
+    mock_make_request.side_effect = page_response
+    
+    result = asyncio.run(zoho_books.aget_invoices())
+    
+    assert [invoice["id"] for invoice in result] == ["1", "2", "3"]
+    assert mock_make_request.call_count == 3
+
+@patch.object(ZohoBooks, '_amake_request')
+def test_aget_invoices_follows_has_more_page(mock_make_request, zoho_books):
+    """Test async pagination when Zoho only reports has_more_page."""
+    mock_make_request.side_effect = [
+        {"invoices": [{"id": "1"}], "page_context": {"has_more_page": True}},
+        {"invoices": [{"id": "2"}], "page_context": {"has_more_page": False}},
+    ]
+    
+    result = asyncio.run(zoho_books.aget_invoices())
+    
+    assert [invoice["id"] for invoice in result] == ["1", "2"]
+
+@patch.object(ZohoBooks, '_make_request')
+def test_get_invoices_for_explicit_organization(mock_make_request, zoho_books):
+    """Test that a per-call organization overrides the configured one."""
+    mock_make_request.return_value = {}
+    
+    zoho_books.get_invoices(organization_id="other_org")
+    
+    assert mock_make_request.call_args.kwargs["params"]["organization_id"] == "other_org"
+
+def test_get_invoices_requires_organization(mock_config):
+    """Test that an organization must be configured or given."""
+    config = mock_config.model_copy(update={"organization_id": None})
+    with patch('src.zoho_integration.get_config', return_value=config):
+        zoho_books = ZohoBooks()
+    
+    with pytest.raises(ValueError):
+        zoho_books.get_invoices()
+
+@patch.object(ZohoBooks, '_amake_request')
+def test_get_invoices_multi(mock_make_request, zoho_books):
+    """Test invoice retrieval fanned out across organizations."""
+    def org_response(method, endpoint, params=None, data=None):
+        return {"invoices": [{"org": params["organization_id"]}]}
+    mock_make_request.side_effect = org_response
+    zoho_books._store_token({"access_token": "test_token", "expires_in": 3600})
+    
+    result = asyncio.run(zoho_books.get_invoices_multi(["org_a", "org_b"]))
+    
+    assert result == {
+        "org_a": [{"org": "org_a"}],
+        "org_b": [{"org": "org_b"}]
+    }
+
+def test_get_client_is_cached_per_organization(mock_config):
+    """Test that clients are shared per organization."""
+    clear_clients()
+    try:
+        with patch('src.zoho_integration.get_config', return_value=mock_config):
+            client = get_client()
+            assert get_client() is client
+            assert client.organization_id == "test_org_id"
+            
+            other = get_client("other_org")
+            assert other is not client
+            assert other.organization_id == "other_org"
+    finally:
+        clear_clients()
+
+def test_get_client_resolves_default_organization(mock_config):
+    """Test that the default organization shares the explicit one's client."""
+    clear_clients()
+    try:
+        with patch('src.zoho_integration.get_config', return_value=mock_config):
+            client = get_client()
+            assert client is get_client("test_org_id")
+            assert client is get_client(organization_id="test_org_id")
+            assert client is get_client(None)
+    finally:
+        clear_clients()